@@ -1,11 +1,36 @@
 """Python package for storing and retrieving experiment parameters."""
 
-from paramdb._param_data._param_data import ParamData
-from paramdb._param_data._dataclasses import ParamDataclass
-from paramdb._param_data._files import ParamFile
-from paramdb._param_data._collections import ParamList, ParamDict
-from paramdb._param_data._type_mixins import ParentType, RootType
-from paramdb._database import ParamDB, CommitEntry, CommitEntryWithData, ParamDBType
+from __future__ import annotations
+from typing import TYPE_CHECKING, Any
+from importlib import import_module
+from importlib.util import find_spec
+
+if TYPE_CHECKING:
+    from paramdb._param_data._param_data import ParamData
+    from paramdb._param_data._dataclasses import ParamDataclass
+    from paramdb._param_data._files import ParamFile, ParamDataFrame
+    from paramdb._param_data._collections import ParamList, ParamDict
+    from paramdb._param_data._type_mixins import ParentType, RootType
+    from paramdb._database import ParamDB, CommitEntry, CommitEntryWithData, ParamDBType
+
+_lazy_imports = {
+    "ParamData": "paramdb._param_data._param_data",
+    "ParamDataclass": "paramdb._param_data._dataclasses",
+    "ParamFile": "paramdb._param_data._files",
+    "ParamList": "paramdb._param_data._collections",
+    "ParamDict": "paramdb._param_data._collections",
+    "ParentType": "paramdb._param_data._type_mixins",
+    "RootType": "paramdb._param_data._type_mixins",
+    "ParamDB": "paramdb._database",
+    "CommitEntry": "paramdb._database",
+    "CommitEntryWithData": "paramdb._database",
+    "ParamDBType": "paramdb._database",
+}
+"""
+Module that each public name is imported from. Names are imported on first access so
+that ``import paramdb`` does not import SQLAlchemy, zstandard, or Pandas until they are
+needed.
+"""
 
 __all__ = [
     "ParamData",
@@ -21,9 +46,19 @@ __all__ = [
     "ParamDBType",
 ]
 
-try:
-    from paramdb._param_data._files import ParamDataFrame
-
+if find_spec("pandas") is not None:
+    _lazy_imports["ParamDataFrame"] = "paramdb._param_data._files"
     __all__ += ["ParamDataFrame"]
-except ImportError:
-    pass
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _lazy_imports:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = getattr(import_module(_lazy_imports[name]), name)
+    globals()[name] = value  # Cache so __getattr__ is not called again
+    return value
+
+
+def __dir__() -> list[str]:
+    # Only public names, not the helpers imported above or submodules
+    return sorted(__all__)
@@ -1,13 +1,44 @@
 """Parameter database backend using SQLAlchemy and SQLite."""
 
+# pylint: disable=too-many-lines
+
 from __future__ import annotations
-from typing import TypeVar, Generic, Literal, Any, overload
-from dataclasses import dataclass
+from typing import TypeVar, Generic, Literal, Any, Callable, overload
+from collections.abc import Generator, Iterable, Mapping
+from dataclasses import dataclass, fields
 from datetime import datetime, timezone
+import io
 import json
-from zstandard import ZstdCompressor, ZstdDecompressor
-from sqlalchemy import Select, URL, create_engine, select, func
+import math
+import os
+import re
+import sqlite3
+import threading
+from functools import cache, partial
+from zstandard import (
+    MAX_COMPRESSION_LEVEL,
+    ZstdCompressor,
+    ZstdDecompressor,
+    ZstdCompressionDict,
+    ZstdError,
+    get_frame_parameters,
+    train_dictionary,
+)
+from sqlalchemy import (
+    Engine,
+    Index,
+    Select,
+    URL,
+    create_engine,
+    delete,
+    event,
+    insert,
+    inspect,
+    select,
+)
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import (
+    Session,
     sessionmaker,
     MappedAsDataclass,
     DeclarativeBase,
@@ -17,14 +48,15 @@ from sqlalchemy.orm import (
 from paramdb._param_data._param_data import ParamData, _ParamWrapper, get_param_class
 
 try:
-    from astropy.units import Quantity  # type: ignore[import-untyped]
+    import orjson
 
-    _ASTROPY_INSTALLED = True
+    _ORJSON_INSTALLED = True
 except ImportError:
-    _ASTROPY_INSTALLED = False
+    _ORJSON_INSTALLED = False
 
 DataT = TypeVar("DataT")
-_SelectT = TypeVar("_SelectT", bound=Select[Any])
+_ContextT = TypeVar("_ContextT")
+_SelectT = TypeVar("_SelectT", bound=Select)  # type: ignore[type-arg]
 
 
 class ParamDBType:
@@ -50,14 +82,220 @@ class ParamDBType:
     """
 
 
-def _compress(text: str) -> bytes:
-    """Compress the given text using Zstandard."""
-    return ZstdCompressor().compress(text.encode())
+_DEFAULT_COMPRESSION_LEVEL = 3
+"""Default Zstandard compression level, which is the default of Zstandard itself."""
+
+_COMPRESS_CHUNK_SIZE = 2**20
+"""
+Number of characters to encode and compress at a time when compressing large ASCII text.
+"""
+
+_MULTITHREADED_COMPRESS_SIZE = 2**23
+"""
+Minimum length of text to compress using multiple threads, if there are multiple CPUs.
+Zstandard splits data into jobs of several MiB, so smaller text would only use one.
+"""
+
+_LOAD_MANY_BATCH_SIZE = 500
+"""
+Maximum number of commits to request in each query of :py:meth:`ParamDB.load_many`,
+which keeps the number of query parameters within the limits of SQLite.
+"""
+
+_zstd_contexts = threading.local()
+"""
+Thread-local Zstandard compressors and decompressors, which are reused between calls to
+avoid reallocating their internal state. These are thread-local since Zstandard contexts
+cannot be used by multiple threads simultaneously.
+"""
+
+
+def _zstd_context(
+    kind: str,
+    zstd_dict: ZstdCompressionDict | None,
+    create: Callable[[ZstdCompressionDict | None], _ContextT],
+) -> _ContextT:
+    """
+    Return the Zstandard context of the given kind for the current thread and the given
+    compression dictionary, creating it with ``create`` if it does not exist yet.
+    """
+    try:
+        contexts: dict[int, tuple[ZstdCompressionDict | None, _ContextT]] = getattr(
+            _zstd_contexts, kind
+        )
+    except AttributeError:
+        contexts = {}
+        setattr(_zstd_contexts, kind, contexts)
+    dict_id = 0 if zstd_dict is None else zstd_dict.dict_id()
+    cached = contexts.get(dict_id)
+    # Dictionaries are also compared by identity, in case two databases have different
+    # dictionaries with the same ID
+    if cached is None or cached[0] is not zstd_dict:
+        cached = contexts[dict_id] = (zstd_dict, create(zstd_dict))
+    return cached[1]
+
+
+def _compressor(
+    zstd_dict: ZstdCompressionDict | None = None,
+    multithreaded: bool = False,
+    level: int = _DEFAULT_COMPRESSION_LEVEL,
+) -> ZstdCompressor:
+    """
+    Return the Zstandard compressor for the current thread, given dictionary, and given
+    compression level. If ``multithreaded`` is True, the compressor uses a worker thread
+    for each CPU.
+    """
+    if multithreaded and (os.cpu_count() or 1) > 1:
+        return _zstd_context(
+            f"multithreaded_compressors_{level}",
+            zstd_dict,
+            lambda zstd_dict: ZstdCompressor(
+                level=level, dict_data=zstd_dict, threads=-1
+            ),
+        )
+    return _zstd_context(
+        f"compressors_{level}",
+        zstd_dict,
+        lambda zstd_dict: ZstdCompressor(level=level, dict_data=zstd_dict),
+    )
+
+
+def _decompressor(zstd_dict: ZstdCompressionDict | None = None) -> ZstdDecompressor:
+    """Return the Zstandard decompressor for the current thread and given dictionary."""
+    return _zstd_context(
+        "decompressors",
+        zstd_dict,
+        lambda zstd_dict: ZstdDecompressor(dict_data=zstd_dict),
+    )
+
+
+def _compress(
+    text: str | bytes,
+    zstd_dict: ZstdCompressionDict | None = None,
+    level: int = _DEFAULT_COMPRESSION_LEVEL,
+) -> bytes:
+    """
+    Compress the given text (or already encoded text) using Zstandard at the given
+    level, optionally with the given compression dictionary.
+
+    Large ASCII text (such as the output of ``json.dumps()``) is encoded and compressed
+    in chunks, so the full encoded text is never stored in memory. Very large text is
+    compressed using multiple threads.
+    """
+    compressor = _compressor(
+        zstd_dict, len(text) >= _MULTITHREADED_COMPRESS_SIZE, level
+    )
+    if isinstance(text, bytes):
+        return compressor.compress(text)
+    if len(text) <= _COMPRESS_CHUNK_SIZE or not text.isascii():
+        return compressor.compress(text.encode())
+    compressed = io.BytesIO()
+    # ASCII text has the same length when encoded, so the frame can include the size
+    with compressor.stream_writer(compressed, size=len(text), closefd=False) as writer:
+        for i in range(0, len(text), _COMPRESS_CHUNK_SIZE):
+            writer.write(text[i : i + _COMPRESS_CHUNK_SIZE].encode())
+    return compressed.getvalue()
+
+
+def _decompress(
+    compressed_text: bytes, zstd_dict: ZstdCompressionDict | None = None
+) -> bytes:
+    """
+    Decompress the given compressed text using Zstandard. If the text was compressed
+    using a dictionary, the same dictionary must be given.
+
+    The text is returned as UTF-8 bytes, since JSON parsers can read bytes directly.
+    """
+    return _decompressor(zstd_dict).decompress(compressed_text)
+
+
+def _compression_dict_id(compressed_text: bytes) -> int:
+    """
+    Return the ID of the dictionary the given compressed text was compressed with, or 0
+    if it was compressed without a dictionary.
+    """
+    return get_frame_parameters(compressed_text).dict_id
+
+
+@cache
+def _quantity_class() -> type[Any] | None:
+    """
+    Return the Astropy ``Quantity`` class, or None if Astropy is not installed.
+
+    Astropy is slow to import, so it is imported the first time this function is called
+    rather than when this module is imported.
+    """
+    # pylint: disable=import-outside-toplevel
+    try:
+        from astropy.units import Quantity  # type: ignore[import-untyped]
+    except ImportError:
+        return None
+    return Quantity  # type: ignore[no-any-return]
+
+
+class _NonFiniteFloat(float):
+    """
+    Float subclass used to mark NaN and infinity in encoded JSON data, since orjson
+    would otherwise encode them as null. orjson does not support float subclasses, so
+    JSON data containing these falls back to ``json.dumps()``.
+    """
+
 
+def _encode_float(obj: float) -> float:
+    """Encode the given float, marking it if it is NaN or infinity."""
+    return obj if math.isfinite(obj) else _NonFiniteFloat(obj)
 
-def _decompress(compressed_text: bytes) -> str:
-    """Decompress the given compressed text using Zstandard."""
-    return ZstdDecompressor().decompress(compressed_text).decode()
+
+def _encode_datetime(obj: datetime) -> dict[str, Any]:
+    """Encode the given datetime."""
+    return {"type": ParamDBType.DATETIME, "timestamp": obj.timestamp()}
+
+
+def _encode_list(obj: list[Any] | tuple[Any, ...]) -> dict[str, Any]:
+    """Encode the given list or tuple and its items."""
+    return {"type": ParamDBType.LIST, "data": [_encode_json(item) for item in obj]}
+
+
+def _encode_dict(obj: dict[Any, Any]) -> dict[str, Any]:
+    """Encode the given dictionary and its values."""
+    return {
+        "type": ParamDBType.DICT,
+        "data": {key: _encode_json(value) for key, value in obj.items()},
+    }
+
+
+def _encode_param_data(obj: ParamData[Any]) -> dict[str, Any]:
+    """Encode the given parameter data object."""
+    if isinstance(obj, _ParamWrapper):
+        return {
+            "type": ParamDBType.PARAM_DATA,
+            "lastUpdated": obj.last_updated.timestamp(),
+            "data": _encode_json(obj.to_json()),
+        }
+    return {
+        "type": ParamDBType.PARAM_DATA,
+        "className": type(obj).__name__,
+        "lastUpdated": obj.last_updated.timestamp(),
+        "data": _encode_json(obj.to_json()),
+    }
+
+
+_JSON_ENCODERS: dict[type, Callable[[Any], Any]] = {
+    int: lambda obj: obj,
+    bool: lambda obj: obj,
+    str: lambda obj: obj,
+    type(None): lambda obj: obj,
+    float: _encode_float,
+    datetime: _encode_datetime,
+    list: _encode_list,
+    tuple: _encode_list,
+    dict: _encode_dict,
+}
+"""
+Encoders for built-in types, keyed by exact type. Looking up the type of an object in
+this dictionary is faster than a chain of ``isinstance()`` checks, which are only used
+for subclasses and other types.
+"""
 
 
 def _encode_json(obj: Any) -> Any:
@@ -66,89 +304,175 @@ def _encode_json(obj: Any) -> Any:
 
     See ``ParamDB.load()`` for the format specification.
     """
-    if isinstance(obj, (int, float, bool, str)) or obj is None:
+    encoder = _JSON_ENCODERS.get(type(obj))
+    if encoder is not None:
+        return encoder(obj)
+    # Parameter data classes are not added to _JSON_ENCODERS, since that would keep them
+    # alive after they are redefined (e.g. in a notebook); this is checked first instead
+    if isinstance(obj, ParamData):
+        return _encode_param_data(obj)
+    if isinstance(obj, float):
+        return _encode_float(obj)
+    if isinstance(obj, (int, str)):
         return obj
     if isinstance(obj, datetime):
-        return {"type": ParamDBType.DATETIME, "timestamp": obj.timestamp()}
-    if _ASTROPY_INSTALLED and isinstance(obj, Quantity):
-        return {"type": ParamDBType.QUANTITY, "value": obj.value, "unit": str(obj.unit)}
+        return _encode_datetime(obj)
     if isinstance(obj, (list, tuple)):
-        return {"type": ParamDBType.LIST, "data": [_encode_json(item) for item in obj]}
+        return _encode_list(obj)
     if isinstance(obj, dict):
+        return _encode_dict(obj)
+    # Checked last so that Astropy is only imported if other types do not match
+    quantity_class = _quantity_class()
+    if quantity_class is not None and isinstance(obj, quantity_class):
         return {
-            "type": ParamDBType.DICT,
-            "data": {key: _encode_json(value) for key, value in obj.items()},
-        }
-    if isinstance(obj, ParamData):
-        encoded_json = {"type": ParamDBType.PARAM_DATA}
-        if not isinstance(obj, _ParamWrapper):
-            encoded_json |= {"className": type(obj).__name__}
-        encoded_json |= {
-            "lastUpdated": obj.last_updated.timestamp(),
-            "data": _encode_json(obj.to_json()),
+            "type": ParamDBType.QUANTITY,
+            "value": _encode_json(obj.value),
+            "unit": str(obj.unit),
         }
-        return encoded_json
     raise TypeError(
         f"'{type(obj).__name__}' object {repr(obj)} is not JSON serializable, so the"
         " commit failed"
     )
 
 
+def _decode_datetime(json_data: dict[str, Any]) -> datetime:
+    """Reconstruct a datetime encoded by ``_encode_json()``."""
+    return datetime.fromtimestamp(json_data["timestamp"], timezone.utc).astimezone()
+
+
+def _decode_quantity(json_data: dict[str, Any]) -> Any:
+    """
+    Reconstruct an Astropy ``Quantity`` encoded by ``_encode_json()``, or return the
+    JSON data unchanged if Astropy is not installed.
+    """
+    quantity_class = _quantity_class()
+    if quantity_class is None:
+        return json_data
+    return quantity_class(value=json_data["value"], unit=json_data["unit"])
+
+
+def _decode_list(json_data: dict[str, Any]) -> list[Any]:
+    """Reconstruct a list encoded by ``_encode_json()``."""
+    decode_json = _decode_json  # Local name is faster to look up before Python 3.11
+    return [decode_json(item) for item in json_data["data"]]
+
+
+def _decode_dict(json_data: dict[str, Any]) -> dict[str, Any]:
+    """Reconstruct a dictionary encoded by ``_encode_json()``."""
+    decode_json = _decode_json  # Local name is faster to look up before Python 3.11
+    return {key: decode_json(value) for key, value in json_data["data"].items()}
+
+
+def _decode_param_data(json_data: dict[str, Any]) -> ParamData[Any]:
+    """Reconstruct parameter data encoded by ``_encode_json()``."""
+    class_name = json_data.get("className", None)
+    param_class = _ParamWrapper if class_name is None else get_param_class(class_name)
+    if param_class is not None:
+        return param_class.from_json(
+            _decode_json(json_data["data"]), json_data["lastUpdated"]
+        )
+    raise ValueError(
+        f"ParamData class '{class_name}' is not known to ParamDB, so the load failed"
+    )
+
+
+_JSON_DECODERS: dict[str, Callable[[dict[str, Any]], Any]] = {
+    ParamDBType.DATETIME: _decode_datetime,
+    ParamDBType.QUANTITY: _decode_quantity,
+    ParamDBType.LIST: _decode_list,
+    ParamDBType.DICT: _decode_dict,
+    ParamDBType.PARAM_DATA: _decode_param_data,
+}
+"""Decoders for encoded JSON objects, keyed by their type string."""
+
+
 def _decode_json(json_data: Any) -> Any:
-    """Reconstruct an object encoded by ``_json_encode()``."""
+    """Reconstruct an object encoded by ``_encode_json()``."""
     if isinstance(json_data, dict):
-        param_db_type = json_data["type"]
-        if param_db_type == ParamDBType.DATETIME:
-            return datetime.fromtimestamp(
-                json_data["timestamp"], timezone.utc
-            ).astimezone()
-        if _ASTROPY_INSTALLED and param_db_type == ParamDBType.QUANTITY:
-            return Quantity(value=json_data["value"], unit=json_data["unit"])
-        if param_db_type == ParamDBType.LIST:
-            return [_decode_json(item) for item in json_data["data"]]
-        if param_db_type == ParamDBType.DICT:
-            return {
-                key: _decode_json(value) for key, value in json_data["data"].items()
-            }
-        if param_db_type == ParamDBType.PARAM_DATA:
-            class_name = json_data.get("className", None)
-            param_class = (
-                _ParamWrapper if class_name is None else get_param_class(class_name)
-            )
-            if param_class is not None:
-                return param_class.from_json(
-                    _decode_json(json_data["data"]), json_data["lastUpdated"]
-                )
-            raise ValueError(
-                f"ParamData class '{class_name}' is not known to ParamDB, so the load"
-                " failed"
-            )
+        decoder = _JSON_DECODERS.get(json_data["type"])
+        if decoder is not None:
+            return decoder(json_data)
     return json_data
 
 
-def _encode(obj: Any, raw_json: bool) -> bytes:
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+"""
+Standard library JSON encoder, created once since ``json.dumps()`` creates a new
+encoder on each call when options are passed.
+"""
+
+
+_LARGE_INTEGER_PATTERN = re.compile(rb"(?<![.\d])\d{19}")
+"""
+Pattern matching JSON that may contain integers outside the 64-bit range, which orjson
+would parse as floats. Digits after a decimal point are skipped, since small floats are
+serialized with long runs of digits there (e.g. ``0.00001757142857142857``), and the
+integer part of a float has at most 16 digits. This only falls back to the standard
+library for large integers and digits within strings.
+"""
+
+
+def _json_dumps(json_data: Any) -> str | bytes:
+    """
+    Serialize the given JSON data, using orjson if it is installed and the standard
+    library otherwise.
+    """
+    if _ORJSON_INSTALLED:
+        try:
+            return orjson.dumps(json_data, option=orjson.OPT_SERIALIZE_NUMPY)
+        except orjson.JSONEncodeError:
+            # E.g. NaN, infinity, integers larger than 64 bits, or non-string keys,
+            # which the standard library converts to strings if they are numbers,
+            # booleans, or None
+            pass
+    return _JSON_ENCODER.encode(json_data)
+
+
+def _json_loads(json_bytes: bytes) -> Any:
     """
-    Encode the given object into bytes that will be stored in the database.
+    Parse the given UTF-8 encoded JSON, using orjson if it is installed and the
+    standard library otherwise.
+    """
+    if _ORJSON_INSTALLED and _LARGE_INTEGER_PATTERN.search(json_bytes) is None:
+        try:
+            return orjson.loads(json_bytes)
+        except orjson.JSONDecodeError:
+            pass  # E.g. NaN and infinity, which orjson does not support
+    return json.loads(json_bytes)
+
+
+def _encode(
+    obj: Any,
+    raw_json: bool,
+    zstd_dict: ZstdCompressionDict | None = None,
+    level: int = _DEFAULT_COMPRESSION_LEVEL,
+) -> bytes:
+    """
+    Encode the given object into bytes that will be stored in the database, compressing
+    at the given level with the given compression dictionary if there is one.
 
     If ``raw_json`` is True, the object will be assumed to be a raw JSON string and will
     only be compressed; otherwise, the given object will be first encoded as a JSON
     string.
     """
     return _compress(
-        obj if raw_json else json.dumps(_encode_json(obj), separators=(",", ":"))
+        obj if raw_json else _json_dumps(_encode_json(obj)), zstd_dict, level
     )
 
 
-def _decode(data: bytes, raw_json: bool) -> Any:
+def _decode(
+    data: bytes, raw_json: bool, zstd_dict: ZstdCompressionDict | None = None
+) -> Any:
     """
-    Decode an object from the given data from the database.
+    Decode an object from the given data from the database, which must have been
+    compressed with the given compression dictionary if there is one.
 
     If ``raw_json`` is True, the raw JSON string will from the database will be
     returned; otherwise, the JSON data will be parsed and decoded into the corresponding
     classes.
     """
-    json_str = _decompress(data)
-    return json_str if raw_json else _decode_json(json.loads(json_str))
+    json_bytes = _decompress(data, zstd_dict)
+    return json_bytes.decode() if raw_json else _decode_json(_json_loads(json_bytes))
 
 
 class _Base(MappedAsDataclass, DeclarativeBase):
@@ -172,10 +496,95 @@ class _Snapshot(_Base):
     """Datetime in UTC time (since this is how SQLite stores datetimes)."""
 
 
+_SNAPSHOT_HISTORY_INDEX = Index(
+    "ix_snapshot_history", _Snapshot.id, _Snapshot.timestamp, _Snapshot.message
+)
+"""
+Covering index for the commit history. Timestamps are stored after the data in each
+row, so without this index, reading the commit history would read the data of every
+commit.
+"""
+
+
+class _CompressionDict(_Base):
+    """Zstandard dictionary used to compress the data of commits."""
+
+    __tablename__ = "compression_dict"
+
+    dict_id: Mapped[int] = mapped_column(unique=True)
+    """Zstandard dictionary ID, which is also stored in data compressed with it."""
+    data: Mapped[bytes]
+    """Dictionary content."""
+    id: Mapped[int] = mapped_column(init=False, primary_key=True)
+    """Row ID, which increases with each new dictionary."""
+
+
+_DEFAULT_PRAGMAS: dict[str, str | int] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,  # Milliseconds
+    "temp_store": "MEMORY",
+    "cache_size": -65536,  # 64 MiB
+    "mmap_size": 2**28,  # 256 MiB
+}
+"""
+Default SQLite PRAGMAs set on each database connection. Write-ahead logging (WAL) with
+``synchronous=NORMAL`` only syncs to disk at checkpoints, which makes commits much
+faster and lets loads run while a commit is in progress. The database cannot be
+corrupted by a crash in this mode, although the most recent commits may be lost on power
+failure. A connection waits up to ``busy_timeout`` for another process to finish writing
+before raising an error.
+"""
+
+
+def _set_pragmas(
+    pragmas: Mapping[str, str | int], dbapi_connection: Any, _connection_record: Any
+) -> None:
+    """
+    Set the given PRAGMAs on a new DBAPI connection. If the database is read-only, it
+    keeps its current journal mode, since changing it would write to the database.
+    """
+    cursor = dbapi_connection.cursor()
+    for name, value in pragmas.items():
+        try:
+            cursor.execute(f"PRAGMA {name}={value}")
+        except sqlite3.OperationalError as exc:
+            if name != "journal_mode" or "readonly" not in str(exc):
+                raise
+    cursor.close()
+
+
+_SQL_LATEST_ID = f"SELECT max(id) FROM {_Snapshot.__tablename__}"
+"""SQL query for the ID of the most recent commit."""
+_SQL_DATA_BY_ID = f"SELECT data FROM {_Snapshot.__tablename__} WHERE id = ?"
+"""SQL query for the data of the commit with a given ID."""
+_SQL_COMMIT_ENTRY_COLUMNS = (
+    f"SELECT id, message, timestamp FROM {_Snapshot.__tablename__}"
+)
+_SQL_LATEST_COMMIT_ENTRY = f"{_SQL_COMMIT_ENTRY_COLUMNS} ORDER BY id DESC LIMIT 1"
+"""SQL query for the commit entry of the most recent commit."""
+_SQL_COMMIT_ENTRY_BY_ID = f"{_SQL_COMMIT_ENTRY_COLUMNS} WHERE id = ?"
+"""SQL query for the commit entry of the commit with a given ID."""
+_SQL_COMMIT_ENTRIES_AFTER_ID = f"{_SQL_COMMIT_ENTRY_COLUMNS} WHERE id > ? ORDER BY id"
+"""SQL query for the commit entries of commits after a given ID."""
+_SQL_COMMIT_ENTRIES_BETWEEN_IDS = (
+    f"{_SQL_COMMIT_ENTRY_COLUMNS} WHERE id > ? AND id <= ? ORDER BY id"
+)
+"""SQL query for the commit entries of commits after a given ID, up to another ID."""
+_SQL_COMPRESSION_DICT_BY_ID = (
+    f"SELECT data FROM {_CompressionDict.__tablename__} WHERE dict_id = ?"
+)
+"""SQL query for the content of the compression dictionary with a given ID."""
+
+
 @dataclass(frozen=True)
 class CommitEntry:
     """Entry for a commit containing the ID, message, and timestamp."""
 
+    # Slots reduce the memory used by long commit histories. These are defined manually
+    # since dataclass(slots=True) requires Python 3.10.
+    __slots__ = ("id", "message", "timestamp")
+
     id: int
     """Commit ID."""
     message: str
@@ -188,6 +597,15 @@ class CommitEntry:
         timestamp_aware = self.timestamp.replace(tzinfo=timezone.utc).astimezone()
         super().__setattr__("timestamp", timestamp_aware)
 
+    # Frozen dataclasses with slots need these for pickling and copying, since the
+    # default implementations restore attributes using the frozen __setattr__()
+    def __getstate__(self) -> tuple[Any, ...]:
+        return tuple(getattr(self, field.name) for field in fields(self))
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        for field, value in zip(fields(self), state):
+            object.__setattr__(self, field.name, value)
+
 
 @dataclass(frozen=True)
 class CommitEntryWithData(CommitEntry, Generic[DataT]):
@@ -197,15 +615,28 @@ class CommitEntryWithData(CommitEntry, Generic[DataT]):
     Entry for a commit containing the ID, message, and timestamp, as well as the data.
     """
 
+    __slots__ = ("data",)
+
     data: DataT
     """Data contained in this commit."""
 
 
+def _commit_entry_from_row(row: tuple[int, str, str]) -> CommitEntry:
+    """
+    Create a commit entry from a row of commit ID, message, and timestamp returned by a
+    DBAPI query, which gives the timestamp as an ISO format string in UTC time.
+    """
+    commit_id, message, timestamp = row
+    return CommitEntry(commit_id, message, datetime.fromisoformat(timestamp))
+
+
+# pylint: disable-next=too-many-instance-attributes
 class ParamDB(Generic[DataT]):
     """
     Parameter database. The database is created in a file at the given path if it does
-    not exist. To work with type checking, this class can be parameterized with a root
-    data type ``DataT``. For example::
+    not exist when it is first used (e.g. by :py:meth:`commit` or :py:meth:`load`), so
+    creating a ``ParamDB`` object is cheap. To work with type checking, this class can
+    be parameterized with a root data type ``DataT``. For example::
 
         from paramdb import ParamDataclass, ParamDB
 
@@ -213,13 +644,155 @@ class ParamDB(Generic[DataT]):
             ...
 
         param_db = ParamDB[Root]("path/to/param.db")
+
+    SQLite PRAGMAs given in ``pragmas`` are set on each database connection, overriding
+    the defaults, which enable write-ahead logging (WAL) with ``synchronous=NORMAL``
+    along with larger caches. WAL does not work for databases on network file systems,
+    in which case ``pragmas={"journal_mode": "DELETE"}`` can be passed. Read-only
+    databases keep their current journal mode. See
+    https://www.sqlite.org/pragma.html and https://www.sqlite.org/wal.html for more
+    information.
+
+    Commits are compressed using Zstandard at the given ``compression_level``, where
+    higher levels make commits smaller but slower to make, and loading is similarly fast
+    for all levels. Levels range from 1 to 22, and negative levels are faster still. A
+    ``ValueError`` is raised for levels above 22. See https://facebook.github.io/zstd/
+    for more information.
     """
 
-    def __init__(self, path: str):
+    def __init__(
+        self,
+        path: str,
+        *,
+        pragmas: Mapping[str, str | int] | None = None,
+        compression_level: int = _DEFAULT_COMPRESSION_LEVEL,
+    ):
+        if compression_level > MAX_COMPRESSION_LEVEL:
+            raise ValueError(
+                f"compression level {compression_level} is greater than the maximum"
+                f" level {MAX_COMPRESSION_LEVEL}"
+            )
         self._path = path
-        self._engine = create_engine(URL.create("sqlite+pysqlite", database=path))
-        self._Session = sessionmaker(self._engine)  # pylint: disable=invalid-name
-        _Base.metadata.create_all(self._engine)
+        self._compression_level = compression_level
+        self._pragmas = _DEFAULT_PRAGMAS | dict(pragmas or {})
+        self._engine: Engine | None = None
+        self._session_maker: sessionmaker[Session] | None = None
+        self._engine_lock = threading.Lock()
+        self._compression_dicts: dict[int, ZstdCompressionDict] = {}
+        self._latest_compression_dict: ZstdCompressionDict | None = None
+
+    def _get_engine(self) -> Engine:
+        """
+        Return the SQLAlchemy engine. The engine is created, along with the database
+        file and tables if they do not exist, the first time this is called.
+        """
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    engine = create_engine(
+                        URL.create("sqlite+pysqlite", database=self._path)
+                    )
+                    event.listen(
+                        engine, "connect", partial(_set_pragmas, self._pragmas)
+                    )
+                    # The compression dictionary table is only created when a
+                    # dictionary is stored, so read-only databases can be opened
+                    _Base.metadata.create_all(
+                        engine, tables=[_Base.metadata.tables[_Snapshot.__tablename__]]
+                    )
+                    # Indexes are only created with their tables, so this adds the index
+                    # to databases created by previous versions. The index only makes
+                    # queries faster, so read-only databases are used without it.
+                    try:
+                        _SNAPSHOT_HISTORY_INDEX.create(engine, checkfirst=True)
+                    except OperationalError as exc:
+                        if "readonly" not in str(exc.orig):
+                            raise
+                    with engine.connect() as connection:
+                        latest_dict_data = (
+                            connection.scalar(
+                                select(_CompressionDict.data)
+                                .order_by(_CompressionDict.id.desc())
+                                .limit(1)
+                            )
+                            if inspect(connection).has_table(
+                                _CompressionDict.__tablename__
+                            )
+                            else None
+                        )
+                    if latest_dict_data is not None:
+                        self._latest_compression_dict = self._add_compression_dict(
+                            ZstdCompressionDict(latest_dict_data)
+                        )
+                    self._session_maker = sessionmaker(engine)
+                    self._engine = engine
+        return self._engine
+
+    @property
+    def _Session(self) -> sessionmaker[Session]:  # pylint: disable=invalid-name
+        """SQLAlchemy session maker (see :py:meth:`_get_engine`)."""
+        if self._session_maker is None:
+            self._get_engine()
+        assert self._session_maker is not None
+        return self._session_maker
+
+    def _fetch_one(self, sql: str, parameters: tuple[Any, ...] = ()) -> Any:
+        """
+        Execute the given SQL query directly on a pooled DBAPI connection and return the
+        first column of the first row, or ``None`` if there are no rows.
+
+        This skips the statement compilation and session overhead of SQLAlchemy, which
+        dominates the time of small queries such as :py:meth:`load`.
+        """
+        connection = self._get_engine().raw_connection()
+        try:
+            row = connection.cursor().execute(sql, parameters).fetchone()
+        finally:
+            connection.close()  # Return the connection to the pool
+        return None if row is None else row[0]
+
+    def _fetch_all(self, sql: str, parameters: tuple[Any, ...] = ()) -> list[Any]:
+        """
+        Execute the given SQL query directly on a pooled DBAPI connection and return
+        all of the rows. See :py:meth:`_fetch_one` for why this is used.
+        """
+        connection = self._get_engine().raw_connection()
+        try:
+            rows: list[Any] = connection.cursor().execute(sql, parameters).fetchall()
+        finally:
+            connection.close()  # Return the connection to the pool
+        return rows
+
+    def _add_compression_dict(
+        self, zstd_dict: ZstdCompressionDict
+    ) -> ZstdCompressionDict:
+        """Cache and return the given compression dictionary."""
+        self._compression_dicts[zstd_dict.dict_id()] = zstd_dict
+        return zstd_dict
+
+    def _compression_dict_for(self, data: bytes) -> ZstdCompressionDict | None:
+        """
+        Return the compression dictionary that the given data from the database was
+        compressed with, or None if it was compressed without a dictionary.
+        """
+        dict_id = _compression_dict_id(data)
+        if dict_id == 0:
+            return None
+        zstd_dict = self._compression_dicts.get(dict_id)
+        if zstd_dict is None:
+            # The dictionary may have been trained by another ParamDB object
+            dict_data = self._fetch_one(_SQL_COMPRESSION_DICT_BY_ID, (dict_id,))
+            if dict_data is None:
+                raise ValueError(
+                    f"compression dictionary {dict_id} does not exist in database"
+                    f" '{self._path}'"
+                )
+            zstd_dict = self._add_compression_dict(ZstdCompressionDict(dict_data))
+        return zstd_dict
+
+    def _decode(self, data: bytes, raw_json: bool) -> Any:
+        """Decode an object from the given data from this database."""
+        return _decode(data, raw_json, self._compression_dict_for(data))
 
     def __repr__(self) -> str:
         return f"{type(self).__name__}(path={self.path!r})"
@@ -236,16 +809,24 @@ class ParamDB(Generic[DataT]):
             else f"commit {commit_id} does not exist in database" f" '{self._path}'"
         )
 
-    def _select_commit(self, select_stmt: _SelectT, commit_id: int | None) -> _SelectT:
+    def _slice_ids(self, start: int | None, end: int | None) -> tuple[int, int | None]:
         """
-        Modify the given ``_Snapshot`` select statement to return the commit specified
-        by the given commit ID, or the latest commit if the commit ID is None.
+        Return the range of commit IDs ``(after_id, last_id)`` corresponding to the
+        given start and end indices, where a ``last_id`` of None means there is no end.
+
+        Commits are never deleted and IDs start from 1, so the commit at index i has ID
+        i + 1. Filtering by ID is a range search, whereas an offset would step through
+        every skipped row.
         """
-        return (
-            select_stmt.order_by(_Snapshot.id.desc()).limit(1)  # Most recent commit
-            if commit_id is None
-            else select_stmt.where(_Snapshot.id == commit_id)  # Specified commit
-        )
+        start = 0 if start is None else start
+        if start < 0 or (end is not None and end < 0):
+            # Only look up the number of commits when it is needed to resolve a
+            # negative index
+            num_commits = self.num_commits
+            start = max(start + num_commits, 0) if start < 0 else start
+            if end is not None and end < 0:
+                end = max(end + num_commits, 0)
+        return start, end
 
     def _select_slice(
         self, select_stmt: _SelectT, start: int | None, end: int | None
@@ -254,13 +835,12 @@ class ParamDB(Generic[DataT]):
         Modify the given Snapshot select statement to sort by commit ID and return the
         slice specified by the given start and end indices.
         """
-        num_commits = self.num_commits
-        start = 0 if start is None else start
-        end = num_commits if end is None else end
-        start = max(start + num_commits, 0) if start < 0 else start
-        end = max(end + num_commits, 0) if end < 0 else end
+        after_id, last_id = self._slice_ids(start, end)
+        select_stmt = select_stmt.where(_Snapshot.id > after_id).order_by(_Snapshot.id)
         return (
-            select_stmt.order_by(_Snapshot.id).offset(start).limit(max(end - start, 0))
+            select_stmt
+            if last_id is None
+            else select_stmt.where(_Snapshot.id <= last_id)
         )
 
     @property
@@ -310,31 +890,96 @@ class ParamDB(Generic[DataT]):
         using this option. If the format is incorrect, loading this particular commit
         may fail.
         """
-        with self._Session.begin() as session:
-            kwargs: dict[str, Any] = {
-                "message": message,
-                "data": _encode(data, raw_json),
-            }
-            if timestamp is not None:
-                utc_offset = timestamp.utcoffset()
-                kwargs["timestamp"] = (
-                    timestamp  # Assume naive datetime is already in UTC
-                    if utc_offset is None
-                    else timestamp.replace(tzinfo=None) - utc_offset  # Convert to UTC
-                )
-            snapshot = _Snapshot(**kwargs)
-            session.add(snapshot)
-            session.flush()  # Flush so the commit ID and timestamp are filled in
-            return CommitEntry(snapshot.id, snapshot.message, snapshot.timestamp)
+        return self._commit_many([(message, data, timestamp)], raw_json)[0]
+
+    @overload
+    def commit_many(
+        self,
+        entries: Iterable[tuple[str, DataT] | tuple[str, DataT, datetime | None]],
+        *,
+        raw_json: Literal[False] = False,
+    ) -> list[CommitEntry]: ...
+
+    @overload
+    def commit_many(
+        self,
+        entries: Iterable[tuple[str, str] | tuple[str, str, datetime | None]],
+        *,
+        raw_json: Literal[True],
+    ) -> list[CommitEntry]: ...
+
+    def commit_many(
+        self,
+        entries: Iterable[tuple[str, Any] | tuple[str, Any, datetime | None]],
+        *,
+        raw_json: bool = False,
+    ) -> list[CommitEntry]:
+        """
+        Commit multiple pieces of data to the database in a single transaction and
+        return a list of commit entries for the new commits, in the given order.
+
+        Each entry is a tuple ``(message, data)`` or ``(message, data, timestamp)``,
+        which are interpreted in the same way as the corresponding arguments of
+        :py:meth:`ParamDB.commit`, as is ``raw_json``. This is much faster than calling
+        :py:meth:`ParamDB.commit` for each entry, and either all or none of the entries
+        are committed.
+        """
+        return self._commit_many(
+            (
+                (entry[0], entry[1], entry[2] if len(entry) > 2 else None)
+                for entry in entries
+            ),
+            raw_json,
+        )
+
+    def _commit_many(
+        self,
+        entries: Iterable[tuple[str, Any, datetime | None]],
+        raw_json: bool,
+    ) -> list[CommitEntry]:
+        """Commit the given ``(message, data, timestamp)`` entries in a transaction."""
+        engine = self._get_engine()  # Also loads the latest compression dictionary
+        rows: list[dict[str, Any]] = []
+        for message, data, timestamp in entries:
+            if timestamp is None:
+                timestamp = datetime.now(timezone.utc)
+            utc_offset = timestamp.utcoffset()
+            rows.append(
+                {
+                    "message": message,
+                    "data": _encode(
+                        data,
+                        raw_json,
+                        self._latest_compression_dict,
+                        self._compression_level,
+                    ),
+                    "timestamp": (
+                        timestamp  # Assume naive datetime is already in UTC
+                        if utc_offset is None
+                        else timestamp.replace(tzinfo=None) - utc_offset  # To UTC
+                    ),
+                }
+            )
+        if not rows:
+            return []
+        # Insert using SQLAlchemy Core, which skips the overhead of ORM objects.
+        # RETURNING is not used since it requires SQLite 3.35. Commits are never
+        # deleted, so new rows are given consecutive IDs after the latest ID.
+        with engine.begin() as connection:
+            connection.execute(insert(_Snapshot), rows)
+            latest_id: int = connection.exec_driver_sql(_SQL_LATEST_ID).scalar_one()
+        return [
+            CommitEntry(commit_id, row["message"], row["timestamp"])
+            for commit_id, row in enumerate(rows, latest_id - len(rows) + 1)
+        ]
 
     @property
     def num_commits(self) -> int:
         """Number of commits in the database."""
-        # pylint: disable-next=not-callable
-        select_stmt = select(func.count()).select_from(_Snapshot)
-        with self._Session() as session:
-            count = session.scalar(select_stmt)
-        return count if count is not None else 0
+        # Commits are never deleted and IDs start from 1, so the number of commits is
+        # the latest ID, which SQLite can look up without counting every row
+        latest_id = self._fetch_one(_SQL_LATEST_ID)
+        return latest_id if latest_id is not None else 0
 
     @overload
     def load(
@@ -368,12 +1013,80 @@ class ParamDB(Generic[DataT]):
                 | {"type": "ParamData", "lastUpdated": float, "data": json_data}
                 | {"type": "ParamData", "className": str, "lastUpdated": float, "data": json_data}
         """  # noqa: E501
-        select_stmt = self._select_commit(select(_Snapshot.data), commit_id)
+        if commit_id is None:
+            commit_id = self._fetch_one(_SQL_LATEST_ID)
+            if commit_id is None:
+                raise self._index_error(None)
+        data = self._fetch_one(_SQL_DATA_BY_ID, (commit_id,))
+        if data is None:
+            raise self._index_error(commit_id)
+        return self._decode(data, raw_json)
+
+    @overload
+    def load_many(
+        self, commit_ids: Iterable[int], *, raw_json: Literal[False] = False
+    ) -> list[DataT]: ...
+
+    @overload
+    def load_many(
+        self, commit_ids: Iterable[int], *, raw_json: Literal[True]
+    ) -> list[str]: ...
+
+    def load_many(self, commit_ids: Iterable[int], *, raw_json: bool = False) -> Any:
+        """
+        Load and return a list of data from the commits with the given IDs, in the same
+        order. Raise an ``IndexError`` if any of the specified commits do not exist.
+
+        This is faster than calling :py:meth:`ParamDB.load` for each commit, since the
+        data is retrieved from the database in as few queries as possible. See
+        :py:meth:`ParamDB.load` for the behavior of ``raw_json``.
+        """
+        commit_ids = list(commit_ids)
+        unique_ids = list(dict.fromkeys(commit_ids))
+        data_by_id: dict[int, bytes] = {}
         with self._Session() as session:
-            data = session.scalar(select_stmt)
+            for i in range(0, len(unique_ids), _LOAD_MANY_BATCH_SIZE):
+                select_stmt = select(_Snapshot.id, _Snapshot.data).where(
+                    _Snapshot.id.in_(unique_ids[i : i + _LOAD_MANY_BATCH_SIZE])
+                )
+                for commit_id, data in session.execute(select_stmt):
+                    data_by_id[commit_id] = data
+        for commit_id in unique_ids:
+            if commit_id not in data_by_id:
+                raise self._index_error(commit_id)
+        return [
+            self._decode(data_by_id[commit_id], raw_json) for commit_id in commit_ids
+        ]
+
+    def iter_raw_json(
+        self, commit_id: int | None = None, *, chunk_size: int = 2**16
+    ) -> Generator[bytes, None, None]:
+        """
+        Iterate over the JSON data of the given commit (or the most recent commit if no
+        commit ID is given) as UTF-8 encoded chunks of up to ``chunk_size`` bytes. Raise
+        an ``IndexError`` if the specified commit does not exist.
+
+        The chunks join to the same JSON data as ``load(commit_id, raw_json=True)``,
+        but the full JSON data is never stored in memory, which is useful for writing
+        large commits to a file.
+        """
+        if commit_id is None:
+            commit_id = self._fetch_one(_SQL_LATEST_ID)
+            if commit_id is None:
+                raise self._index_error(None)
+        data = self._fetch_one(_SQL_DATA_BY_ID, (commit_id,))
         if data is None:
             raise self._index_error(commit_id)
-        return _decode(data, raw_json)
+        return self._iter_raw_json(data, chunk_size)
+
+    def _iter_raw_json(
+        self, data: bytes, chunk_size: int
+    ) -> Generator[bytes, None, None]:
+        """Generator for :py:meth:`iter_raw_json`."""
+        # A new decompressor is used since the thread-local one may be used by other
+        # calls while this generator is suspended
+        decompressor = ZstdDecompressor(dict_data=self._compression_dict_for(data))
+        yield from decompressor.read_to_iter(data, write_size=chunk_size)
 
     def load_commit_entry(self, commit_id: int | None = None) -> CommitEntry:
         """
@@ -382,14 +1095,14 @@ class ParamDB(Generic[DataT]):
         ``IndexError`` if the specified commit does not exist. Note that commit IDs
         begin at 1.
         """
-        select_stmt = self._select_commit(
-            select(_Snapshot.id, _Snapshot.message, _Snapshot.timestamp), commit_id
+        rows = (
+            self._fetch_all(_SQL_LATEST_COMMIT_ENTRY)
+            if commit_id is None
+            else self._fetch_all(_SQL_COMMIT_ENTRY_BY_ID, (commit_id,))
         )
-        with self._Session() as session:
-            commit_entry = session.execute(select_stmt).mappings().first()
-        if commit_entry is None:
+        if not rows:
             raise self._index_error(commit_id)
-        return None if commit_entry is None else CommitEntry(**commit_entry)
+        return _commit_entry_from_row(rows[0])
 
     def commit_history(
         self, start: int | None = None, end: int | None = None
@@ -398,12 +1111,13 @@ class ParamDB(Generic[DataT]):
         Retrieve the commit history as a list of :py:class:`CommitEntry` objects between
         the provided start and end indices, which work like slicing a Python list.
         """
-        select_stmt = self._select_slice(
-            select(_Snapshot.id, _Snapshot.message, _Snapshot.timestamp), start, end
+        after_id, last_id = self._slice_ids(start, end)
+        rows = (
+            self._fetch_all(_SQL_COMMIT_ENTRIES_AFTER_ID, (after_id,))
+            if last_id is None
+            else self._fetch_all(_SQL_COMMIT_ENTRIES_BETWEEN_IDS, (after_id, last_id))
         )
-        with self._Session() as session:
-            entries = session.execute(select_stmt).mappings()
-        return [CommitEntry(**dict(row_mapping)) for row_mapping in entries]
+        return [_commit_entry_from_row(row) for row in rows]
 
     @overload
     def commit_history_with_data(
@@ -437,18 +1151,142 @@ class ParamDB(Generic[DataT]):
 
         See :py:meth:`ParamDB.load` for the behavior of ``raw_json``.
         """
+        return list(self._iter_commit_history_with_data(start, end, raw_json, 64))
+
+    @overload
+    def iter_commit_history_with_data(
+        self,
+        start: int | None = None,
+        end: int | None = None,
+        *,
+        raw_json: Literal[False] = False,
+        batch_size: int = 64,
+    ) -> Generator[CommitEntryWithData[DataT], None, None]: ...
+
+    @overload
+    def iter_commit_history_with_data(
+        self,
+        start: int | None = None,
+        end: int | None = None,
+        *,
+        raw_json: Literal[True],
+        batch_size: int = 64,
+    ) -> Generator[CommitEntryWithData[str], None, None]: ...
+
+    def iter_commit_history_with_data(
+        self,
+        start: int | None = None,
+        end: int | None = None,
+        *,
+        raw_json: bool = False,
+        batch_size: int = 64,
+    ) -> Generator[CommitEntryWithData[Any], None, None]:
+        """
+        Iterate over the same :py:class:`CommitEntryWithData` objects as
+        :py:meth:`commit_history_with_data`, fetching ``batch_size`` commits from the
+        database at a time. Only one batch of commit data is stored in memory at once,
+        which is useful for long histories.
+
+        The database stays open for reading until the iterator is exhausted or closed.
+        """
+        return self._iter_commit_history_with_data(start, end, raw_json, batch_size)
+
+    def _iter_commit_history_with_data(
+        self, start: int | None, end: int | None, raw_json: bool, batch_size: int
+    ) -> Generator[CommitEntryWithData[Any], None, None]:
+        """Generator for :py:meth:`iter_commit_history_with_data`."""
+        # Select columns rather than Snapshot objects to skip ORM object loading
+        select_stmt = self._select_slice(
+            select(
+                _Snapshot.id, _Snapshot.message, _Snapshot.timestamp, _Snapshot.data
+            ),
+            start,
+            end,
+        )
         with self._Session() as session:
-            select_stmt = self._select_slice(select(_Snapshot), start, end)
-            snapshots = session.scalars(select_stmt)
-            return [
-                CommitEntryWithData(
-                    snapshot.id,
-                    snapshot.message,
-                    snapshot.timestamp,
-                    _decode(snapshot.data, raw_json),
+            for commit_id, message, timestamp, data in session.execute(
+                select_stmt
+            ).yield_per(batch_size):
+                yield CommitEntryWithData(
+                    commit_id, message, timestamp, self._decode(data, raw_json)
                 )
-                for snapshot in snapshots
+
+    def train_compression_dict(
+        self, num_samples: int = 100, dict_size: int = 16384
+    ) -> None:
+        """
+        Train a Zstandard compression dictionary of up to ``dict_size`` bytes on the
+        data of the most recent ``num_samples`` commits, store it in the database, and
+        use it to compress future commits. Raise a ``ValueError`` if there is not enough
+        data to train a dictionary.
+
+        Dictionaries improve the compression of commits that are small and share a
+        similar structure, which makes the database smaller and commits and loads
+        faster. Previous commits are unchanged, and are loaded using the dictionary (if
+        any) they were compressed with.
+        """
+        select_stmt = (
+            select(_Snapshot.data).order_by(_Snapshot.id.desc()).limit(num_samples)
+        )
+        with self._Session() as session:
+            samples: list[bytes | bytearray | memoryview] = [
+                _decompress(data, self._compression_dict_for(data))
+                for data in session.scalars(select_stmt)
             ]
+        try:
+            zstd_dict = train_dictionary(dict_size, samples)
+        except ZstdError as exc:
+            raise ValueError(
+                f"cannot train compression dictionary from {len(samples)} commits in"
+                f" database '{self._path}'"
+            ) from exc
+        self._store_compression_dict(zstd_dict)
+
+    @property
+    def compression_dict(self) -> bytes | None:
+        """
+        Content of the Zstandard compression dictionary used to compress new commits,
+        or None if new commits are compressed without a dictionary. This can be passed
+        to :py:meth:`set_compression_dict` of another database with similar data.
+        """
+        self._get_engine()
+        zstd_dict = self._latest_compression_dict
+        return None if zstd_dict is None else zstd_dict.as_bytes()
+
+    def set_compression_dict(self, dict_data: bytes) -> None:
+        """
+        Store the given Zstandard compression dictionary in the database and use it to
+        compress future commits. For example, this can be the
+        :py:attr:`compression_dict` of another database with similar data, so that a
+        new database can use a dictionary before it has enough commits to train one.
+        Raise a ``ValueError`` if the data is not a Zstandard dictionary.
+        """
+        zstd_dict = ZstdCompressionDict(dict_data)
+        # Raw content dictionaries have no ID, so their frames cannot be identified
+        if zstd_dict.dict_id() == 0:
+            raise ValueError("compression dictionary is not a Zstandard dictionary")
+        self._store_compression_dict(zstd_dict)
+
+    def _store_compression_dict(self, zstd_dict: ZstdCompressionDict) -> None:
+        """
+        Store the given compression dictionary in the database as the latest one, and
+        use it to compress future commits.
+        """
+        with self._Session.begin() as session:
+            _Base.metadata.tables[_CompressionDict.__tablename__].create(
+                session.connection(), checkfirst=True
+            )
+            # If the dictionary is already stored, it is removed and stored again so
+            # that it has the highest row ID, which marks the latest dictionary
+            session.execute(
+                delete(_CompressionDict).where(
+                    _CompressionDict.dict_id == zstd_dict.dict_id()
+                )
+            )
+            session.add(
+                _CompressionDict(dict_id=zstd_dict.dict_id(), data=zstd_dict.as_bytes())
+            )
+        self._latest_compression_dict = self._add_compression_dict(zstd_dict)
 
     def dispose(self) -> None:
         """
@@ -460,4 +1298,5 @@ class ParamDB(Generic[DataT]):
         https://docs.sqlalchemy.org/en/20/core/connections.html#engine-disposal for more
         information.
         """
-        self._engine.dispose()
+        if self._engine is not None:
+            self._engine.dispose()
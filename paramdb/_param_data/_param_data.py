@@ -3,6 +3,7 @@
 from __future__ import annotations
 from typing import Union, TypeVar, Generic, Any, cast
 from abc import ABC, abstractmethod
+from importlib import import_module
 from weakref import WeakValueDictionary
 from datetime import datetime, timezone
 from typing_extensions import Self, Never
@@ -19,9 +20,26 @@ _param_classes: WeakValueDictionary[str, type[ParamData[Any]]] = WeakValueDictio
 """Dictionary of weak references to existing ``ParamData`` classes."""
 
 
+_BUILT_IN_MODULES = (
+    "paramdb._param_data._dataclasses",
+    "paramdb._param_data._files",
+    "paramdb._param_data._collections",
+    "paramdb._param_data._type_mixins",
+)
+"""
+Modules defining built-in ``ParamData`` classes. Since ``paramdb`` imports these lazily,
+they may not have been imported (and so registered) yet when a commit is loaded.
+"""
+
+
 def get_param_class(class_name: str) -> type[ParamData[Any]] | None:
     """Get a parameter class given its name, or ``None`` if the class does not exist."""
-    return _param_classes[class_name] if class_name in _param_classes else None
+    param_class = _param_classes.get(class_name)
+    if param_class is None:
+        for module_name in _BUILT_IN_MODULES:
+            import_module(module_name)
+        param_class = _param_classes.get(class_name)
+    return param_class
 
 
 class ParamData(ABC, Generic[ChildNameT]):
@@ -3,15 +3,28 @@
 # Pylint has trouble recognizing that ParamDB.commit_history_with_data() is
 # subscriptable.
 # pylint: disable=unsubscriptable-object
+# pylint: disable=too-many-lines
 
 from __future__ import annotations
 from typing import Any
-from copy import deepcopy
+from copy import copy, deepcopy
+from contextlib import closing
 import os
+import sys
+import sqlite3
+import subprocess
 from pathlib import Path
 from datetime import datetime, timezone
+from collections import OrderedDict
+from enum import Enum
 import json
+import math
+import pickle
+import gc
+import weakref
 import pytest
+from sqlalchemy import URL, create_engine
+from sqlalchemy.exc import OperationalError
 from tests.helpers import (
     EmptyParam,
     SimpleParam,
@@ -24,6 +37,7 @@ from tests.helpers import (
     update_child,
     capture_start_end_times,
 )
+import paramdb
 from paramdb import (
     ParamData,
     ParamDataclass,
@@ -55,18 +69,200 @@ def fixture_db_path(tmp_path: Path) -> str:
 
 
 def test_create_database(db_path: str) -> None:
-    """Parameter DB can be created on disk."""
+    """Parameter DB is created on disk when it is first used."""
     assert not os.path.exists(db_path)
-    ParamDB[Any](db_path)
+    param_db = ParamDB[Any](db_path)
+    assert not os.path.exists(db_path)
+    assert param_db.num_commits == 0
     assert os.path.exists(db_path)
 
 
+def test_history_index(db_path: str, simple_param: SimpleParam) -> None:
+    """
+    Parameter DB has a covering index for the commit history, which is also added to
+    databases that do not have it yet.
+    """
+    select_indexes = (
+        "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'snapshot'"
+    )
+    param_db = ParamDB[SimpleParam](db_path)
+    param_db.commit("Initial commit", simple_param)
+    param_db.dispose()
+    with closing(sqlite3.connect(db_path)) as connection:
+        assert connection.execute(select_indexes).fetchall() == [
+            ("ix_snapshot_history",)
+        ]
+        connection.execute("DROP INDEX ix_snapshot_history")
+    param_db = ParamDB[SimpleParam](db_path)
+    assert param_db.commit_history()[0].message == "Initial commit"
+    param_db.dispose()
+    with closing(sqlite3.connect(db_path)) as connection:
+        assert connection.execute(select_indexes).fetchall() == [
+            ("ix_snapshot_history",)
+        ]
+
+
+def test_dispose_unused_database(db_path: str) -> None:
+    """Parameter DB that was never used can be disposed without creating it."""
+    param_db = ParamDB[Any](db_path)
+    param_db.dispose()
+    assert not os.path.exists(db_path)
+
+
+def test_default_pragmas(db_path: str) -> None:
+    """Parameter DB uses write-ahead logging and the default PRAGMAs."""
+    param_db = ParamDB[Any](db_path)
+    assert param_db.num_commits == 0
+    with closing(sqlite3.connect(db_path)) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    # pylint: disable=protected-access
+    assert param_db._fetch_one("PRAGMA synchronous") == 1  # NORMAL
+    assert param_db._fetch_one("PRAGMA busy_timeout") == 5000
+    assert param_db._fetch_one("PRAGMA temp_store") == 2  # MEMORY
+    param_db.dispose()
+
+
+def test_custom_pragmas(db_path: str, simple_param: SimpleParam) -> None:
+    """Parameter DB PRAGMAs can be overridden."""
+    param_db = ParamDB[SimpleParam](
+        db_path,
+        pragmas={"journal_mode": "DELETE", "synchronous": "FULL", "busy_timeout": 100},
+    )
+    param_db.commit("Initial commit", simple_param)
+    with closing(sqlite3.connect(db_path)) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone() == ("delete",)
+    # pylint: disable=protected-access
+    assert param_db._fetch_one("PRAGMA synchronous") == 2  # FULL
+    assert param_db._fetch_one("PRAGMA busy_timeout") == 100
+    assert param_db._fetch_one("PRAGMA temp_store") == 2  # MEMORY
+    assert_param_data_strong_equals(param_db.load(), simple_param, "number")
+    param_db.dispose()
+
+
+def test_compression_level(db_path: str) -> None:
+    """Parameter DB compresses commits at the given compression level."""
+    data = [i / 7 for i in range(10000)]
+    blob_sizes = []
+    for level in [1, 19]:
+        path = f"{db_path}.{level}"
+        param_db = ParamDB[list[float]](path, compression_level=level)
+        param_db.commit("Initial commit", data)
+        assert param_db.load() == data
+        # pylint: disable-next=protected-access
+        blob_sizes.append(param_db._fetch_one("SELECT length(data) FROM snapshot"))
+        param_db.dispose()
+    assert blob_sizes[1] < blob_sizes[0]
+
+
+def test_compression_level_invalid_fails(db_path: str) -> None:
+    """Fails to create a parameter DB with a compression level that is too high."""
+    with pytest.raises(ValueError) as exc_info:
+        ParamDB[Any](db_path, compression_level=23)
+    assert (
+        str(exc_info.value)
+        == "compression level 23 is greater than the maximum level 22"
+    )
+    param_db = ParamDB[Any](db_path, compression_level=22)
+    param_db.commit("Initial commit", [1, 2])
+    assert param_db.load() == [1, 2]
+    param_db.dispose()
+
+
+def read_only_param_db(
+    db_path: str, monkeypatch: pytest.MonkeyPatch, **kwargs: Any
+) -> ParamDB[Any]:
+    """
+    Return a parameter DB that opens the database file in read-only mode, as SQLite does
+    for files without write permission (which does not apply to the root user).
+    """
+
+    def create_read_only_engine(url: URL) -> Any:
+        return create_engine(
+            url, creator=lambda: sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        )
+
+    monkeypatch.setattr("paramdb._database.create_engine", create_read_only_engine)
+    return ParamDB[Any](db_path, **kwargs)
+
+
+def test_read_only(
+    db_path: str, monkeypatch: pytest.MonkeyPatch, simple_param: SimpleParam
+) -> None:
+    """Parameter DB can load from a database file that cannot be written to."""
+    param_db = ParamDB[SimpleParam](db_path, pragmas={"journal_mode": "DELETE"})
+    param_db.commit("Initial commit", simple_param)
+    param_db.dispose()
+    # Databases created by previous versions have no compression dictionary table or
+    # commit history index
+    with closing(sqlite3.connect(db_path)) as connection:
+        connection.execute("DROP TABLE IF EXISTS compression_dict")
+        connection.execute("DROP INDEX ix_snapshot_history")
+    read_only_db = read_only_param_db(
+        db_path, monkeypatch, pragmas={"journal_mode": "DELETE"}
+    )
+    assert read_only_db.num_commits == 1
+    assert read_only_db.compression_dict is None
+    assert_param_data_strong_equals(read_only_db.load(), simple_param, "number")
+    assert [entry.id for entry in read_only_db.commit_history()] == [1]
+    with pytest.raises(OperationalError):
+        read_only_db.commit("Second commit", simple_param)
+    read_only_db.dispose()
+    # Read-only databases keep their journal mode instead of switching to WAL
+    read_only_db = read_only_param_db(db_path, monkeypatch)
+    assert read_only_db.num_commits == 1
+    # pylint: disable-next=protected-access
+    assert read_only_db._fetch_one("PRAGMA journal_mode") == "delete"
+    read_only_db.dispose()
+
+
 def test_path(db_path: str) -> None:
     """Database path can be retrieved."""
     param_db = ParamDB[Any](db_path)
     assert param_db.path == db_path
 
 
+def test_astropy_not_imported() -> None:
+    """Importing ParamDB does not import Astropy, which is slow to import."""
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from paramdb import ParamDB;"
+            " assert 'astropy' not in sys.modules",
+        ],
+        cwd=Path(__file__).parent.parent,
+        check=True,
+    )
+
+
+def test_dir() -> None:
+    """``dir(paramdb)`` lists the public names, including ones not imported yet."""
+    assert dir(paramdb) == sorted(paramdb.__all__)
+    assert "ParamDB" in dir(paramdb)
+    assert "import_module" not in dir(paramdb)
+
+
+def test_load_built_in_class_not_imported(db_path: str) -> None:
+    """
+    Can load a built-in parameter class that has not been imported yet, since
+    ``paramdb`` imports its submodules lazily.
+    """
+    param_db = ParamDB[ParamList[int]](db_path)
+    param_db.commit("Initial commit", ParamList([1, 2, 3]))
+    param_db.dispose()
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from paramdb import ParamDB;"
+            " assert 'paramdb._param_data._collections' not in sys.modules;"
+            f" assert list(ParamDB({db_path!r}).load()) == [1, 2, 3]",
+        ],
+        cwd=Path(__file__).parent.parent,
+        check=True,
+    )
+
+
 def test_commit_not_json_serializable_fails(db_path: str) -> None:
     """Fails to commit a class that ParamDB does not know how to convert to JSON."""
 
@@ -84,6 +280,35 @@ def test_commit_not_json_serializable_fails(db_path: str) -> None:
     )
 
 
+def test_commit_does_not_keep_param_class(db_path: str) -> None:
+    """Committing does not keep a parameter data class alive after it is deleted."""
+
+    class Temporary(ParamDataclass):
+        """Parameter data class that is deleted after it is committed."""
+
+        number: float
+
+    param_db = ParamDB[Any](db_path)
+    param_db.commit("Initial commit", Temporary(number=1.23))
+    class_ref = weakref.ref(Temporary)
+    del Temporary
+    gc.collect()
+    assert class_ref() is None
+
+
+def test_commit_dict_keys(db_path: str) -> None:
+    """
+    Dictionary keys that are numbers or None are committed as strings, and
+    committing other non-string keys fails.
+    """
+    param_db = ParamDB[dict[Any, str]](db_path)
+    param_db.commit("Initial commit", {1: "int", 1.5: "float", None: "none"})
+    assert param_db.load() == {"1": "int", "1.5": "float", "null": "none"}
+    with pytest.raises(TypeError):
+        param_db.commit("Datetime key", {datetime.now(): "datetime"})
+    assert param_db.num_commits == 1
+
+
 def test_load_unknown_class_fails(db_path: str) -> None:
     """
     Fails to load an instance of an unknown class (i.e. one that is unknown to ParamDB).
@@ -330,6 +555,117 @@ def test_commit_and_load_complex(
     assert_param_data_strong_equals(root_from_history, root, "number")
 
 
+def test_commit_and_load_large(db_path: str) -> None:
+    """Can commit and load data whose JSON representation is larger than 1 MiB."""
+    param_db = ParamDB[list[str]](db_path)
+    data = ["a" * 2**10 for _ in range(2**11)]
+    param_db.commit("Initial commit", data)
+    assert param_db.load() == data
+
+
+def test_commit_and_load_multithreaded(
+    db_path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Can commit and load data that is compressed using multiple threads."""
+    monkeypatch.setattr(os, "cpu_count", lambda: 4)
+    monkeypatch.setattr("paramdb._database._MULTITHREADED_COMPRESS_SIZE", 2**10)
+    param_db = ParamDB[list[str]](db_path)
+    data = ["a" * 2**10 for _ in range(2**11)]
+    param_db.commit("Initial commit", data)
+    param_db.commit("Raw JSON commit", param_db.load(raw_json=True), raw_json=True)
+    assert param_db.load(1) == data
+    assert param_db.load(2) == data
+
+
+def test_iter_raw_json(db_path: str) -> None:
+    """Can iterate over the raw JSON data of a commit in chunks."""
+    param_db = ParamDB[list[str]](db_path)
+    with pytest.raises(IndexError) as exc_info:
+        param_db.iter_raw_json()
+    assert (
+        str(exc_info.value)
+        == f"cannot load most recent commit because database '{db_path}' has no"
+        " commits"
+    )
+    data = ["a" * 2**10 for _ in range(2**11)]
+    param_db.commit("Commit 1", data)
+    param_db.commit("Commit 2", ["b"])
+    chunks = list(param_db.iter_raw_json(1, chunk_size=2**12))
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 2**12 for chunk in chunks)
+    assert b"".join(chunks).decode() == param_db.load(1, raw_json=True)
+    assert b"".join(param_db.iter_raw_json()).decode() == param_db.load(raw_json=True)
+    with pytest.raises(IndexError) as exc_info:
+        param_db.iter_raw_json(3)
+    assert str(exc_info.value) == f"commit 3 does not exist in database '{db_path}'"
+
+
+def test_commit_and_load_special_values(db_path: str) -> None:
+    """
+    Can commit and load values that not all JSON libraries support, namely NaN,
+    infinity, and integers larger than 64 bits.
+    """
+    param_db = ParamDB[list[Any]](db_path)
+    param_db.commit("Non-finite floats", [math.nan, math.inf, -math.inf, None])
+    nan, inf, negative_inf, none = param_db.load()
+    assert math.isnan(nan)
+    assert inf == math.inf
+    assert negative_inf == -math.inf
+    assert none is None
+    large_ints = [2**70 + 1, 2**64, -(2**63) - 1]
+    param_db.commit("Large integers", large_ints)
+    loaded_large_ints = param_db.load()
+    assert loaded_large_ints == large_ints
+    assert all(isinstance(value, int) for value in loaded_large_ints)
+
+
+def test_load_small_floats_with_orjson(
+    db_path: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """
+    Small floats, which are serialized with many digits after the decimal point, are
+    parsed by orjson rather than the standard library fallback.
+    """
+    pytest.importorskip("orjson")
+    param_db = ParamDB[list[float]](db_path)
+    small_floats = [1.757142857142857e-05, 0.0075309924525170935, 1.23e-9]
+    param_db.commit("Small floats", small_floats)
+
+    def fail_json_loads(*_args: Any, **_kwargs: Any) -> Any:
+        raise AssertionError("json.loads() should not be called")
+
+    monkeypatch.setattr(json, "loads", fail_json_loads)
+    assert param_db.load() == small_floats
+
+
+def test_commit_and_load_built_in_subclasses(db_path: str) -> None:
+    """Can commit and load subclasses of built-in types, which load as the base type."""
+
+    class FloatSubclass(float):
+        """Subclass of ``float``."""
+
+    class StrEnumLike(str, Enum):
+        """Enum whose values are strings."""
+
+        VALUE = "value"
+
+    param_db = ParamDB[list[Any]](db_path)
+    param_db.commit(
+        "Initial commit",
+        [
+            FloatSubclass(1.5),
+            FloatSubclass(math.inf),
+            StrEnumLike.VALUE,
+            OrderedDict(a=1),
+            datetime.fromtimestamp(0, timezone.utc),
+        ],
+    )
+    loaded = param_db.load()
+    epoch = datetime.fromtimestamp(0, timezone.utc)
+    assert loaded == [1.5, math.inf, "value", {"a": 1}, epoch]
+    assert [type(value) for value in loaded] == [float, float, str, dict, datetime]
+
+
 def test_commit_load_latest(db_path: str) -> None:
     """The database can load the latest data and commit entry after each commit."""
     param_db = ParamDB[SimpleParam](db_path)
@@ -378,6 +714,109 @@ def test_commit_load_multiple(db_path: str) -> None:
         assert_param_data_strong_equals(param_from_history, param, "number")
 
 
+def test_commit_many(db_path: str) -> None:
+    """Can commit multiple entries at once and load them back."""
+    param_db = ParamDB[SimpleParam](db_path)
+    param_db.commit("Initial commit", SimpleParam(number=0))
+    timestamp = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    params = [SimpleParam(number=i + 1) for i in range(3)]
+    with capture_start_end_times():
+        commit_entries = param_db.commit_many(
+            [
+                ("Commit 1", params[0]),
+                ("Commit 2", params[1], timestamp),
+                ("Commit 3", params[2], None),
+            ]
+        )
+    assert [commit_entry.id for commit_entry in commit_entries] == [2, 3, 4]
+    assert [commit_entry.message for commit_entry in commit_entries] == [
+        "Commit 1",
+        "Commit 2",
+        "Commit 3",
+    ]
+    assert commit_entries[1].timestamp == timestamp
+    assert param_db.commit_history(1) == commit_entries
+    for commit_entry, param in zip(commit_entries, params):
+        assert_param_data_strong_equals(param_db.load(commit_entry.id), param, "number")
+    assert param_db.commit_many([]) == []
+    assert param_db.num_commits == 4
+
+
+def test_commit_many_raw_json(db_path: str, simple_param: SimpleParam) -> None:
+    """Can commit multiple raw JSON entries at once."""
+    param_db = ParamDB[SimpleParam](db_path)
+    param_db.commit("Initial commit", simple_param)
+    raw_json = param_db.load(raw_json=True)
+    commit_entries = param_db.commit_many(
+        [("Commit 2", raw_json), ("Commit 3", raw_json)], raw_json=True
+    )
+    assert [commit_entry.id for commit_entry in commit_entries] == [2, 3]
+    assert param_db.load(3, raw_json=True) == raw_json
+
+
+def test_commit_many_not_json_serializable_fails(db_path: str) -> None:
+    """If any entry fails to be committed, none of the entries are committed."""
+    param_db = ParamDB[Any](db_path)
+    with pytest.raises(TypeError):
+        param_db.commit_many([("Commit 1", 123), ("Commit 2", object())])
+    assert param_db.num_commits == 0
+
+
+def test_load_many(db_path: str, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Can load multiple commits at once, in the given order."""
+    monkeypatch.setattr("paramdb._database._LOAD_MANY_BATCH_SIZE", 2)
+    param_db = ParamDB[SimpleParam](db_path)
+    params = [SimpleParam(number=i + 1) for i in range(5)]
+    for i, param in enumerate(params):
+        param_db.commit(f"Commit {i + 1}", param)
+    commit_ids = [5, 1, 3, 1, 4, 2]
+    params_loaded = param_db.load_many(commit_ids)
+    assert len(params_loaded) == len(commit_ids)
+    for commit_id, param_loaded in zip(commit_ids, params_loaded):
+        assert_param_data_strong_equals(param_loaded, params[commit_id - 1], "number")
+    assert params_loaded[1] is not params_loaded[3]
+    assert param_db.load_many(iter([2, 3]), raw_json=True) == [
+        param_db.load(2, raw_json=True),
+        param_db.load(3, raw_json=True),
+    ]
+    assert param_db.load_many([]) == []
+
+
+def test_load_many_nonexistent_commit_fails(
+    db_path: str, simple_param: SimpleParam
+) -> None:
+    """Fails to load multiple commits if any of them do not exist."""
+    param_db = ParamDB[SimpleParam](db_path)
+    param_db.commit("Initial commit", simple_param)
+    with pytest.raises(IndexError) as exc_info:
+        param_db.load_many([1, 100])
+    assert str(exc_info.value) == f"commit 100 does not exist in database '{db_path}'"
+
+
+def test_load_repeated(db_path: str) -> None:
+    """Loading the same commit repeatedly returns equal but independent objects."""
+    param_db = ParamDB[ParamDict[Any]](db_path)
+    param = ParamDict(p=SimpleParam(number=1), l=[1, 2], d={"a": 1})
+    param_db.commit("Initial commit", param)
+    param_db.commit("Second commit", ParamDict())
+    for commit_id in (1, 2, 1, None, 2, 1):
+        param_loaded = param_db.load(commit_id)
+        assert param_loaded == (ParamDict() if commit_id != 1 else param)
+        param_loaded["l"] = param_loaded.get("l", []) + [3]
+        if commit_id == 1:
+            param_loaded.p.number += 1
+            param_loaded.d["b"] = 2
+    assert param_db.load(1, raw_json=True) == param_db.load(1, raw_json=True)
+    # JSON data that is not encoded by ParamDB is returned as parsed
+    param_db.commit(
+        "Raw JSON commit", '{"type": "unknown", "data": [1, 2]}', raw_json=True
+    )
+    for _ in range(2):
+        raw_loaded = param_db.load()
+        assert raw_loaded == {"type": "unknown", "data": [1, 2]}
+        raw_loaded["data"].append(3)
+
+
 def test_separate_connections(db_path: str, simple_param: SimpleParam) -> None:
     """
     Can commit and load using separate connections. This simulates committing to the
@@ -395,6 +834,109 @@ def test_separate_connections(db_path: str, simple_param: SimpleParam) -> None:
     assert_param_data_strong_equals(param_loaded, simple_param, "number")
 
 
+def test_train_compression_dict(db_path: str) -> None:
+    """
+    Can train a compression dictionary, which is used for future commits, and load
+    commits made before and after training.
+    """
+    param_db = ParamDB[SimpleParam](db_path)
+    params = [SimpleParam(number=i) for i in range(20)]
+    for param in params[:10]:
+        param_db.commit("Commit", param)
+    param_db.train_compression_dict()
+    for param in params[10:]:
+        param_db.commit("Commit", param)
+    for i, param in enumerate(params):
+        assert_param_data_strong_equals(param_db.load(i + 1), param, "number")
+    assert [entry.data for entry in param_db.commit_history_with_data()] == params
+    assert (
+        param_db.load(1, raw_json=True)
+        == param_db.commit_history_with_data(0, 1, raw_json=True)[0].data
+    )
+    assert (
+        b"".join(param_db.iter_raw_json(11)).decode()
+        == param_db.commit_history_with_data(10, 11, raw_json=True)[0].data
+    )
+
+    # Commits made with a new connection also use the dictionary
+    param_db2 = ParamDB[SimpleParam](db_path)
+    param_db2.commit("Commit", params[0])
+    assert_param_data_strong_equals(param_db.load(), params[0], "number")
+    assert_param_data_strong_equals(param_db2.load(11), params[10], "number")
+
+
+def test_set_compression_dict(tmp_path: Path) -> None:
+    """
+    Can use the compression dictionary of one database to compress the commits of
+    another database.
+    """
+    param_db1 = ParamDB[SimpleParam](str(tmp_path / "param1.db"))
+    param_db2 = ParamDB[SimpleParam](str(tmp_path / "param2.db"))
+    assert param_db1.compression_dict is None
+    for i in range(10):
+        param_db1.commit("Commit", SimpleParam(number=i))
+    param_db1.train_compression_dict()
+    compression_dict = param_db1.compression_dict
+    assert compression_dict is not None
+    param_db2.set_compression_dict(compression_dict)
+    assert param_db2.compression_dict == compression_dict
+    simple_param = SimpleParam(number=1)
+    param_db2.commit("Initial commit", simple_param)
+    param_db2.dispose()
+    param_db2 = ParamDB[SimpleParam](str(tmp_path / "param2.db"))
+    assert param_db2.compression_dict == compression_dict
+    assert_param_data_strong_equals(param_db2.load(), simple_param, "number")
+
+
+def test_set_stored_compression_dict(db_path: str) -> None:
+    """
+    Setting a compression dictionary that is already stored in the database makes it
+    the dictionary used to compress future commits, including after reopening.
+    """
+    param_db = ParamDB[SimpleParam](db_path)
+    for i in range(10):
+        param_db.commit("Commit", SimpleParam(number=i))
+    param_db.train_compression_dict()
+    compression_dict1 = param_db.compression_dict
+    for i in range(10):
+        param_db.commit("Another commit", SimpleParam(number=i * 1.5))
+    param_db.train_compression_dict(num_samples=10)
+    compression_dict2 = param_db.compression_dict
+    assert compression_dict1 is not None
+    assert compression_dict2 is not None
+    assert compression_dict1 != compression_dict2
+    param_db.set_compression_dict(compression_dict1)
+    assert param_db.compression_dict == compression_dict1
+    param_db.commit("Final commit", SimpleParam(number=1))
+    param_db.dispose()
+    param_db = ParamDB[SimpleParam](db_path)
+    assert param_db.compression_dict == compression_dict1
+    assert [param.number for param in param_db.load_many([1, 20, 21])] == [0, 13.5, 1]
+    param_db.dispose()
+
+
+def test_set_compression_dict_invalid_fails(db_path: str) -> None:
+    """Fails to set a compression dictionary that is not a Zstandard dictionary."""
+    param_db = ParamDB[SimpleParam](db_path)
+    with pytest.raises(ValueError) as exc_info:
+        param_db.set_compression_dict(b"not a dictionary")
+    assert str(exc_info.value) == "compression dictionary is not a Zstandard dictionary"
+    assert param_db.compression_dict is None
+
+
+def test_train_compression_dict_too_few_commits_fails(db_path: str) -> None:
+    """Fails to train a compression dictionary if there is not enough data."""
+    param_db = ParamDB[SimpleParam](db_path)
+    with pytest.raises(ValueError) as exc_info:
+        param_db.train_compression_dict()
+    assert (
+        str(exc_info.value)
+        == f"cannot train compression dictionary from 0 commits in database '{db_path}'"
+    )
+    param_db.commit("Initial commit", SimpleParam(number=1))
+    assert param_db.load() == SimpleParam(number=1)
+
+
 def test_empty_num_commits(db_path: str) -> None:
     """An empty database has no commits according to num_commits."""
     param_db = ParamDB[SimpleParam](db_path)
@@ -505,3 +1047,42 @@ def test_commit_history_slice(db_path: str, simple_param: SimpleParam) -> None:
             param_db.commit_history_with_data(start, end)
             == commit_history_with_data[start:end]
         )
+        assert (
+            list(param_db.iter_commit_history_with_data(start, end, batch_size=3))
+            == commit_history_with_data[start:end]
+        )
+
+
+def test_iter_commit_history_with_data(db_path: str, simple_param: SimpleParam) -> None:
+    """
+    Can iterate over the commit history with data, including stopping early and
+    committing while iterating.
+    """
+    param_db = ParamDB[SimpleParam](db_path)
+    for i in range(10):
+        param_db.commit(f"Commit {i}", simple_param)
+    commit_history_with_data = param_db.commit_history_with_data()
+    history_iter = param_db.iter_commit_history_with_data(batch_size=4)
+    for i in range(5):
+        assert next(history_iter) == commit_history_with_data[i]
+    param_db.commit("Commit while iterating", simple_param)
+    assert list(history_iter) == commit_history_with_data[5:]
+    raw_history_iter = param_db.iter_commit_history_with_data(raw_json=True)
+    assert next(raw_history_iter).data == param_db.load(1, raw_json=True)
+    raw_history_iter.close()
+    assert param_db.num_commits == 11
+
+
+def test_copy_and_pickle_commit_entries(
+    db_path: str, simple_param: SimpleParam
+) -> None:
+    """Commit entries can be copied and pickled, and have no instance dictionary."""
+    param_db = ParamDB[SimpleParam](db_path)
+    param_db.commit("Initial commit", simple_param)
+    commit_entry = param_db.load_commit_entry()
+    commit_entry_with_data = param_db.commit_history_with_data()[0]
+    for entry in commit_entry, commit_entry_with_data:
+        assert not hasattr(entry, "__dict__")
+        assert copy(entry) == entry
+        assert deepcopy(entry) == entry
+        assert pickle.loads(pickle.dumps(entry)) == entry